@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, Response
 from flask_cors import CORS
 import tensorflow as tf
 import numpy as np
@@ -7,6 +7,10 @@ from PIL import Image
 import cv2
 import json
 import pickle
+import hmac
+import os
+import metrics
+from profiler import profiler
 from models.crop_yield_model import CropYieldPredictor
 from models.disease_detection_model import DiseaseDetector
 from models.recommendation_engine import RecommendationEngine
@@ -19,30 +23,83 @@ yield_predictor = CropYieldPredictor()
 disease_detector = DiseaseDetector()
 recommendation_engine = RecommendationEngine()
 
+metrics.set_model_version('crop_yield', yield_predictor.model_version)
+metrics.set_model_version('disease_detection', disease_detector.model_version)
+
+@app.before_request
+def start_request_profiling():
+    profiler.poll()
+    profiler.enter_request(request.endpoint)
+
+@app.teardown_request
+def stop_request_profiling(exception):
+    profiler.exit_request()
+
+def is_admin_request():
+    token = os.environ.get('PROFILER_ADMIN_TOKEN')
+    if not token:
+        return False
+    # Werkzeug decodes headers as latin-1; compare_digest rejects non-ASCII str
+    supplied = request.headers.get('X-Admin-Token', '')
+    return hmac.compare_digest(supplied.encode('utf-8'), token.encode('utf-8'))
+
 @app.route('/')
 def home():
     return render_template('index.html')
 
+@app.route('/metrics')
+def prometheus_metrics():
+    body, content_type = metrics.generate_metrics()
+    return Response(body, mimetype=content_type)
+
+@app.route('/admin/profile', methods=['GET', 'POST'])
+def admin_profile():
+    if not is_admin_request():
+        return jsonify({'success': False, 'error': 'Forbidden'}), 403
+    
+    if request.method == 'GET':
+        return jsonify({'success': True, 'profiler': profiler.status()})
+    
+    try:
+        # A bare POST opens a window with the defaults
+        data = request.get_json(silent=True) or {}
+        window = profiler.start(
+            data.get('duration', 30),
+            interval=data.get('interval', 0.005),
+            fraction=data.get('fraction', 1.0)
+        )
+        return jsonify({'success': True, 'window': window})
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
 @app.route('/predict_yield', methods=['POST'])
+@metrics.instrumented('predict_yield')
 def predict_yield():
     try:
-        data = request.json
+        with metrics.track_stage('predict_yield', 'parse'):
+            data = request.json
+            
+            # Extract features
+            features = {
+                'area': float(data.get('area', 0)),
+                'rainfall': float(data.get('rainfall', 0)),
+                'temperature': float(data.get('temperature', 0)),
+                'humidity': float(data.get('humidity', 0)),
+                'ph': float(data.get('ph', 0)),
+                'nitrogen': float(data.get('nitrogen', 0)),
+                'phosphorus': float(data.get('phosphorus', 0)),
+                'potassium': float(data.get('potassium', 0)),
+                'crop_type': data.get('crop_type', 'wheat')
+            }
         
-        # Extract features
-        features = {
-            'area': float(data.get('area', 0)),
-            'rainfall': float(data.get('rainfall', 0)),
-            'temperature': float(data.get('temperature', 0)),
-            'humidity': float(data.get('humidity', 0)),
-            'ph': float(data.get('ph', 0)),
-            'nitrogen': float(data.get('nitrogen', 0)),
-            'phosphorus': float(data.get('phosphorus', 0)),
-            'potassium': float(data.get('potassium', 0)),
-            'crop_type': data.get('crop_type', 'wheat')
-        }
+        stats = {}
+        prediction = yield_predictor.predict(features, stats)
+        metrics.observe_model_call('predict_yield', 'crop_yield', stats)
+        metrics.set_model_version('crop_yield', yield_predictor.model_version)
         
-        prediction = yield_predictor.predict(features)
-        recommendations = yield_predictor.get_yield_recommendations(features)
+        with metrics.track_stage('predict_yield', 'recommendations'):
+            recommendations = yield_predictor.get_yield_recommendations(features)
         
         return jsonify({
             'success': True,
@@ -52,35 +109,49 @@ def predict_yield():
         })
         
     except Exception as e:
+        metrics.record_error('predict_yield', e)
         return jsonify({'success': False, 'error': str(e)})
 
 @app.route('/detect_disease', methods=['POST'])
+@metrics.instrumented('detect_disease')
 def detect_disease():
     try:
-        if 'image' not in request.files:
+        # Accessing request.files parses the multipart upload
+        with metrics.track_stage('detect_disease', 'upload'):
+            files = request.files
+        
+        if 'image' not in files:
+            metrics.record_error('detect_disease', 'no_image_provided')
             return jsonify({'success': False, 'error': 'No image provided'})
         
-        file = request.files['image']
+        file = files['image']
         if file.filename == '':
+            metrics.record_error('detect_disease', 'no_image_selected')
             return jsonify({'success': False, 'error': 'No image selected'})
         
-        # Process image
-        image = Image.open(file.stream)
+        # Process image; Image.open is lazy so force the decode here
+        with metrics.track_stage('detect_disease', 'decode'):
+            image = Image.open(file.stream)
+            image.load()
         
         # Detect disease
-        disease_result = disease_detector.predict(image)
+        stats = {}
+        disease_result = disease_detector.predict(image, stats)
+        metrics.observe_model_call('detect_disease', 'disease_detection', stats)
+        metrics.set_model_version('disease_detection', disease_detector.model_version)
         
         # Get medicine recommendations
-        if disease_result['confidence'] > 0.7:
-            medicine_suggestions = recommendation_engine.get_medicine_suggestions(
-                disease_result['disease']
-            )
-            treatment_tips = recommendation_engine.get_treatment_tips(
-                disease_result['disease']
-            )
-        else:
-            medicine_suggestions = []
-            treatment_tips = ["Image quality insufficient for accurate diagnosis"]
+        with metrics.track_stage('detect_disease', 'recommendations'):
+            if disease_result['confidence'] > 0.7:
+                medicine_suggestions = recommendation_engine.get_medicine_suggestions(
+                    disease_result['disease']
+                )
+                treatment_tips = recommendation_engine.get_treatment_tips(
+                    disease_result['disease']
+                )
+            else:
+                medicine_suggestions = []
+                treatment_tips = ["Image quality insufficient for accurate diagnosis"]
         
         return jsonify({
             'success': True,
@@ -91,19 +162,23 @@ def detect_disease():
         })
         
     except Exception as e:
+        metrics.record_error('detect_disease', e)
         return jsonify({'success': False, 'error': str(e)})
 
 @app.route('/get_recommendations', methods=['POST'])
+@metrics.instrumented('get_recommendations')
 def get_recommendations():
     try:
-        data = request.json
-        crop_type = data.get('crop_type')
-        season = data.get('season')
-        location = data.get('location')
+        with metrics.track_stage('get_recommendations', 'parse'):
+            data = request.json
+            crop_type = data.get('crop_type')
+            season = data.get('season')
+            location = data.get('location')
         
-        recommendations = recommendation_engine.get_crop_recommendations(
-            crop_type, season, location
-        )
+        with metrics.track_stage('get_recommendations', 'recommendations'):
+            recommendations = recommendation_engine.get_crop_recommendations(
+                crop_type, season, location
+            )
         
         return jsonify({
             'success': True,
@@ -111,6 +186,7 @@ def get_recommendations():
         })
         
     except Exception as e:
+        metrics.record_error('get_recommendations', e)
         return jsonify({'success': False, 'error': str(e)})
 
 if __name__ == '__main__':
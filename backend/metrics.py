@@ -0,0 +1,147 @@
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+
+# Latency buckets cover everything from dict lookups (sub-millisecond) to
+# a cold model.predict on a large image (several seconds)
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+SIZE_BUCKETS = (
+    256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216
+)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+REQUEST_LATENCY = Histogram(
+    'smart_agriculture_request_latency_seconds',
+    'End-to-end latency of a prediction request',
+    ['endpoint'],
+    buckets=LATENCY_BUCKETS
+)
+STAGE_LATENCY = Histogram(
+    'smart_agriculture_stage_latency_seconds',
+    'Latency of a single stage within a prediction request',
+    ['endpoint', 'stage'],
+    buckets=LATENCY_BUCKETS
+)
+REQUEST_SIZE = Histogram(
+    'smart_agriculture_request_size_bytes',
+    'Size of the request body',
+    ['endpoint'],
+    buckets=SIZE_BUCKETS
+)
+BATCH_SIZE = Histogram(
+    'smart_agriculture_batch_size',
+    'Number of samples passed to model.predict',
+    ['endpoint', 'model'],
+    buckets=BATCH_BUCKETS
+)
+ERRORS = Counter(
+    'smart_agriculture_errors_total',
+    'Failed prediction requests by error type',
+    ['endpoint', 'error_type']
+)
+MODEL_INFO = Gauge(
+    'smart_agriculture_model_info',
+    'Version of the model currently serving requests',
+    ['model', 'version'],
+    multiprocess_mode='liveall'
+)
+
+_model_versions = {}
+
+
+def multiprocess_enabled():
+    """Check whether metrics are shared between gunicorn workers"""
+    return bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+
+@contextmanager
+def track_stage(endpoint, stage):
+    """Time a block of code as one stage of an endpoint"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(endpoint, stage, time.perf_counter() - start)
+
+
+def observe_stage(endpoint, stage, seconds):
+    """Record the duration of a stage that was timed elsewhere"""
+    STAGE_LATENCY.labels(endpoint, stage).observe(seconds)
+
+
+def observe_request(endpoint, seconds, size):
+    """Record end-to-end latency and body size of a request"""
+    REQUEST_LATENCY.labels(endpoint).observe(seconds)
+    if size is not None:
+        REQUEST_SIZE.labels(endpoint).observe(size)
+
+
+def instrumented(endpoint):
+    """Decorate a view to record its end-to-end latency and body size"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return view(*args, **kwargs)
+            finally:
+                observe_request(
+                    endpoint, time.perf_counter() - start, request.content_length
+                )
+        return wrapper
+    return decorator
+
+
+def observe_model_call(endpoint, model, stats):
+    """Record the stage timings and batch size reported by a model"""
+    for stage in ('preprocess', 'inference'):
+        if stage in stats:
+            observe_stage(endpoint, stage, stats[stage])
+    if 'batch_size' in stats:
+        BATCH_SIZE.labels(endpoint, model).observe(stats['batch_size'])
+
+
+def record_error(endpoint, error):
+    """Count a failed request; error may be an exception or a short label"""
+    if isinstance(error, BaseException):
+        error_type = type(error).__name__
+    else:
+        error_type = str(error)
+    ERRORS.labels(endpoint, error_type).inc()
+
+
+def set_model_version(model, version):
+    """Publish the version of a loaded model, retiring the previous one"""
+    previous = _model_versions.get(model)
+    if previous == version:
+        return
+    if previous is not None:
+        MODEL_INFO.labels(model, previous).set(0)
+    MODEL_INFO.labels(model, version).set(1)
+    _model_versions[model] = version
+
+
+def generate_metrics():
+    """Render all metrics in Prometheus text format"""
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -6,6 +6,7 @@ from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.model_selection import train_test_split
 import pickle
 import os
+import time
 
 class CropYieldPredictor:
     def __init__(self):
@@ -13,6 +14,7 @@ class CropYieldPredictor:
         self.scaler = StandardScaler()
         self.label_encoder = LabelEncoder()
         self.is_trained = False
+        self.model_version = 'untrained'
         self.load_model()
     
     def create_model(self, input_shape):
@@ -111,12 +113,18 @@ class CropYieldPredictor:
         print("Model training completed!")
         return history
     
-    def predict(self, features):
-        """Predict crop yield"""
+    def predict(self, features, stats=None):
+        """Predict crop yield
+        
+        If a stats dict is given it is filled with the preprocess and
+        inference times in seconds and the batch size sent to the model.
+        """
         if not self.is_trained:
             print("Training model...")
             self.train()
         
+        start = time.perf_counter()
+        
         # Convert crop type to encoded value
         crop_types = ['wheat', 'rice', 'corn', 'soybean', 'cotton']
         if features['crop_type'] in crop_types:
@@ -139,10 +147,16 @@ class CropYieldPredictor:
         
         # Scale features
         feature_scaled = self.scaler.transform(feature_array)
+        preprocessed = time.perf_counter()
         
         # Make prediction
         prediction = self.model.predict(feature_scaled)[0][0]
         
+        if stats is not None:
+            stats['preprocess'] = preprocessed - start
+            stats['inference'] = time.perf_counter() - preprocessed
+            stats['batch_size'] = feature_scaled.shape[0]
+        
         return max(0, prediction)  # Ensure non-negative yield
     
     def get_yield_recommendations(self, features):
@@ -184,6 +198,13 @@ class CropYieldPredictor:
         
         with open('models/trained_models/yield_label_encoder.pkl', 'wb') as f:
             pickle.dump(self.label_encoder, f)
+        
+        self.model_version = self.get_model_version()
+    
+    def get_model_version(self):
+        """Identify the saved model by its modification time"""
+        mtime = os.path.getmtime('models/trained_models/crop_yield_model.h5')
+        return time.strftime('%Y%m%d%H%M%S', time.gmtime(mtime))
     
     def load_model(self):
         """Load trained model and preprocessors"""
@@ -197,6 +218,7 @@ class CropYieldPredictor:
                 self.label_encoder = pickle.load(f)
             
             self.is_trained = True
+            self.model_version = self.get_model_version()
             print("Yield prediction model loaded successfully!")
             
         except Exception as e:
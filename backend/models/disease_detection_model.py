@@ -4,6 +4,7 @@ import cv2
 import numpy as np
 from PIL import Image
 import os
+import time
 
 class DiseaseDetector:
     def __init__(self):
@@ -13,6 +14,7 @@ class DiseaseDetector:
             'tungro', 'bacterial_leaf_streak', 'sheath_blight'
         ]
         self.is_trained = False
+        self.model_version = 'untrained'
         self.load_model()
     
     def create_model(self):
@@ -101,17 +103,29 @@ class DiseaseDetector:
         print("Disease detection model training completed!")
         return history
     
-    def predict(self, image):
-        """Predict disease from image"""
+    def predict(self, image, stats=None):
+        """Predict disease from image
+        
+        If a stats dict is given it is filled with the preprocess and
+        inference times in seconds and the batch size sent to the model.
+        """
         if not self.is_trained:
             print("Training disease detection model...")
             self.train()
         
         # Preprocess image
+        start = time.perf_counter()
         processed_image = self.preprocess_image(image)
+        preprocessed = time.perf_counter()
         
         # Make prediction
         predictions = self.model.predict(processed_image)
+        
+        if stats is not None:
+            stats['preprocess'] = preprocessed - start
+            stats['inference'] = time.perf_counter() - preprocessed
+            stats['batch_size'] = processed_image.shape[0]
+        
         predicted_class_idx = np.argmax(predictions[0])
         confidence = float(predictions[0][predicted_class_idx])
         
@@ -128,12 +142,19 @@ class DiseaseDetector:
         """Save trained model"""
         os.makedirs('models/trained_models', exist_ok=True)
         self.model.save('models/trained_models/disease_detection_model.h5')
+        self.model_version = self.get_model_version()
+    
+    def get_model_version(self):
+        """Identify the saved model by its modification time"""
+        mtime = os.path.getmtime('models/trained_models/disease_detection_model.h5')
+        return time.strftime('%Y%m%d%H%M%S', time.gmtime(mtime))
     
     def load_model(self):
         """Load trained model"""
         try:
             self.model = keras.models.load_model('models/trained_models/disease_detection_model.h5')
             self.is_trained = True
+            self.model_version = self.get_model_version()
             print("Disease detection model loaded successfully!")
             
         except Exception as e:
@@ -0,0 +1,259 @@
+import glob
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+# Frames from these packages count as time spent inside TensorFlow
+TENSORFLOW_PACKAGES = ('tensorflow', 'keras')
+MAX_DURATION = 300
+# Finer sampling would keep the sampler thread holding the GIL
+MIN_INTERVAL = 0.001
+MAX_STACK_DEPTH = 128
+POLL_INTERVAL = 1.0
+
+
+class SamplingProfiler:
+    """On-demand stack sampling profiler for request-serving threads
+
+    While a profiling window is open a background thread periodically
+    snapshots the stacks of threads that are serving a selected request.
+    Nothing is sampled while profiling is off; the request hooks only
+    compare a timestamp. Windows are shared between gunicorn workers
+    through a trigger file in the output directory.
+    """
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.trigger_path = os.path.join(output_dir, 'trigger.json')
+        self.active = False
+        self.fraction = 1.0
+        self.interval = 0.005
+        self.until = 0.0
+        self.last_summary = None
+        self._threads = {}
+        self._stacks = Counter()
+        self._lock = threading.Lock()
+        self._trigger_mtime = None
+        self._next_poll = 0.0
+
+    def start(self, duration, interval=0.005, fraction=1.0):
+        """Open a profiling window in every worker"""
+        duration = float(duration)
+        interval = float(interval)
+        fraction = float(fraction)
+        if not all(math.isfinite(value) for value in (duration, interval, fraction)):
+            raise ValueError("duration, interval and fraction must be finite")
+        if duration <= 0:
+            raise ValueError("duration must be positive")
+        if interval < MIN_INTERVAL:
+            raise ValueError(f"interval must be at least {MIN_INTERVAL} seconds")
+        if not 0 < fraction <= 1:
+            raise ValueError("fraction must be between 0 and 1")
+        duration = min(duration, MAX_DURATION)
+
+        trigger = {
+            'until': time.time() + duration,
+            'interval': interval,
+            'fraction': fraction
+        }
+        os.makedirs(self.output_dir, exist_ok=True)
+        tmp_path = f"{self.trigger_path}.{os.getpid()}"
+        with open(tmp_path, 'w') as f:
+            json.dump(trigger, f)
+        os.replace(tmp_path, self.trigger_path)
+
+        self._next_poll = 0.0
+        self.poll()
+        return trigger
+
+    def poll(self):
+        """Pick up a window opened by another worker, at most once a second"""
+        now = time.monotonic()
+        if now < self._next_poll:
+            return
+        self._next_poll = now + POLL_INTERVAL
+
+        try:
+            mtime = os.stat(self.trigger_path).st_mtime
+        except OSError:
+            return
+        if mtime == self._trigger_mtime:
+            return
+        self._trigger_mtime = mtime
+
+        try:
+            with open(self.trigger_path) as f:
+                trigger = json.load(f)
+        except (OSError, ValueError):
+            return
+        if trigger['until'] > time.time():
+            self._begin(trigger)
+
+    def _begin(self, trigger):
+        """Start the sampler thread for a new window"""
+        with self._lock:
+            self.until = trigger['until']
+            self.interval = trigger['interval']
+            self.fraction = trigger['fraction']
+            if self.active:
+                return
+            self.active = True
+            self._stacks = Counter()
+
+        thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        thread.start()
+
+    def enter_request(self, endpoint):
+        """Register the current thread if this request is selected"""
+        if not self.active:
+            return
+        if endpoint is None:
+            # Requests that match no route, such as scanner 404s
+            endpoint = '<unmatched>'
+        if self.fraction < 1.0 and random.random() >= self.fraction:
+            return
+        self._threads[threading.get_ident()] = endpoint
+
+    def exit_request(self):
+        """Stop sampling the current thread"""
+        if self._threads:
+            self._threads.pop(threading.get_ident(), None)
+
+    def _run(self):
+        """Sample registered threads until the window closes"""
+        finished = False
+        try:
+            while True:
+                with self._lock:
+                    if time.time() >= self.until:
+                        self.active = False
+                        self._threads.clear()
+                        stacks = self._stacks
+                        interval = self.interval
+                        finished = True
+                        break
+
+                frames = sys._current_frames()
+                for ident, endpoint in list(self._threads.items()):
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        self._stacks[(endpoint, self._walk(frame))] += 1
+                del frames
+                time.sleep(self.interval)
+        finally:
+            # Never leave the worker stuck in an active window that no
+            # thread is sampling, or profiling could not be restarted
+            if not finished:
+                with self._lock:
+                    self.active = False
+                    self._threads.clear()
+
+        self.last_summary = self._write_report(stacks, interval)
+
+    def _walk(self, frame):
+        """Turn a frame into a root-first tuple of (label, filename)"""
+        stack = []
+        while frame is not None and len(stack) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            stack.append((label, code.co_filename))
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+    def _write_report(self, stacks, interval):
+        """Write collapsed stacks and a per-endpoint summary to disk"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = time.strftime('%Y%m%d%H%M%S', time.gmtime())
+        base = os.path.join(self.output_dir, f"profile-{stamp}-{os.getpid()}")
+
+        # Collapsed stack format, readable by flamegraph.pl and speedscope
+        with open(f"{base}.collapsed", 'w') as f:
+            for (endpoint, stack), count in stacks.items():
+                labels = [str(endpoint)] + [label for label, _ in stack]
+                f.write(f"{';'.join(labels)} {count}\n")
+
+        summary = summarize(stacks, interval)
+        summary['pid'] = os.getpid()
+        summary['collapsed_stacks'] = f"{base}.collapsed"
+        with open(f"{base}.json", 'w') as f:
+            json.dump(summary, f, indent=2)
+
+        return summary
+
+    def status(self):
+        """Describe this worker's window and the reports of all workers
+
+        last_summary only covers the worker that answered; every worker
+        writes its own profile-*.json into the output directory, and
+        those are listed under reports.
+        """
+        reports = sorted(glob.glob(os.path.join(self.output_dir, 'profile-*.json')))
+        return {
+            'active': self.active,
+            'seconds_remaining': max(0.0, self.until - time.time()) if self.active else 0.0,
+            'interval': self.interval,
+            'fraction': self.fraction,
+            'pid': os.getpid(),
+            'last_summary': self.last_summary,
+            'reports': reports
+        }
+
+
+def is_tensorflow_frame(filename):
+    """Check whether a frame belongs to TensorFlow or Keras"""
+    parts = filename.replace('\\', '/').split('/')
+    return any(package in parts for package in TENSORFLOW_PACKAGES)
+
+
+def summarize(stacks, interval, top=20):
+    """Build per-endpoint hot function and TensorFlow time summaries"""
+    endpoints = defaultdict(lambda: {
+        'samples': 0,
+        'tensorflow_samples': 0,
+        'self': Counter(),
+        'inclusive': Counter()
+    })
+
+    for (endpoint, stack), count in stacks.items():
+        entry = endpoints[endpoint]
+        entry['samples'] += count
+        if any(is_tensorflow_frame(filename) for _, filename in stack):
+            entry['tensorflow_samples'] += count
+        if stack:
+            entry['self'][stack[-1][0]] += count
+        for label in {label for label, _ in stack}:
+            entry['inclusive'][label] += count
+
+    summary = {'interval': interval, 'endpoints': {}}
+    for endpoint, entry in endpoints.items():
+        samples = entry['samples']
+        summary['endpoints'][endpoint] = {
+            'samples': samples,
+            'tensorflow_fraction': entry['tensorflow_samples'] / samples,
+            'python_fraction': 1 - entry['tensorflow_samples'] / samples,
+            'hot_functions': [
+                {
+                    'function': label,
+                    'self_samples': count,
+                    'inclusive_samples': entry['inclusive'][label]
+                }
+                for label, count in entry['self'].most_common(top)
+            ],
+            'hot_inclusive': [
+                {'function': label, 'inclusive_samples': count}
+                for label, count in entry['inclusive'].most_common(top)
+            ]
+        }
+
+    return summary
+
+
+profiler = SamplingProfiler(
+    os.environ.get('PROFILER_OUTPUT_DIR', '/tmp/smart_agriculture_profiles')
+)
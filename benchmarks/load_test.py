@@ -0,0 +1,207 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+from payloads import (
+    IMAGE_RESOLUTIONS, encode_image, leaf_image, recommendation_payload, yield_payload
+)
+from report import latency_summary
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+GUNICORN_CONFIG = os.path.join(REPO_ROOT, 'deployment', 'gunicorn.conf.py')
+STARTUP_TIMEOUT = 300
+TRAINED_MODELS = [
+    os.path.join(REPO_ROOT, 'models', 'trained_models', name)
+    for name in (
+        'crop_yield_model.h5', 'yield_scaler.pkl', 'yield_label_encoder.pkl',
+        'disease_detection_model.h5'
+    )
+]
+
+
+def start_server(workers, port):
+    """Start the backend under gunicorn and wait until it serves requests"""
+    metrics_dir = tempfile.mkdtemp(prefix='bench_metrics_')
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=metrics_dir)
+    process = subprocess.Popen(
+        [
+            sys.executable, '-m', 'gunicorn',
+            '--config', GUNICORN_CONFIG,
+            '--bind', f'127.0.0.1:{port}',
+            '--workers', str(workers),
+            '--pythonpath', os.path.join(REPO_ROOT, 'backend'),
+            'app:app'
+        ],
+        cwd=REPO_ROOT,
+        env=env
+    )
+
+    url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+            raise RuntimeError(f"gunicorn exited with code {process.returncode}")
+        try:
+            if requests.get(f'{url}/metrics', timeout=1).status_code == 200:
+                return process, url, metrics_dir
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+
+    stop_server(process, metrics_dir)
+    raise RuntimeError(f"Server did not start within {STARTUP_TIMEOUT}s")
+
+
+def stop_server(process, metrics_dir):
+    """Shut down gunicorn and remove its metric files"""
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
+def worker_pids(master_pid):
+    """Find the gunicorn workers forked by the master process"""
+    pids = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # The command name may contain spaces, so split after it
+                fields = f.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == master_pid:
+            pids.append(int(entry))
+    return pids
+
+
+def peak_rss_kb(pid):
+    """Read the high-water mark of a process's resident memory"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def build_scenarios(seed):
+    """Create the request generators for every load-test scenario"""
+    rng = np.random.default_rng(seed)
+    lock = threading.Lock()
+
+    def json_scenario(path, make_payload):
+        def send(session, url):
+            with lock:
+                payload = make_payload(rng)
+            return session.post(f'{url}{path}', json=payload, timeout=60)
+        return send
+
+    def image_scenario(body):
+        def send(session, url):
+            files = {'image': ('leaf.jpg', body, 'image/jpeg')}
+            return session.post(f'{url}/detect_disease', files=files, timeout=60)
+        return send
+
+    scenarios = {
+        'predict_yield': json_scenario('/predict_yield', yield_payload),
+        'get_recommendations': json_scenario('/get_recommendations', recommendation_payload)
+    }
+    for width, height in IMAGE_RESOLUTIONS:
+        body = encode_image(leaf_image(width, height, seed=seed))
+        scenarios[f'detect_disease.{width}x{height}'] = image_scenario(body)
+
+    return scenarios
+
+
+def drive(send, url, concurrency, duration):
+    """Send requests from concurrent clients for a fixed duration"""
+    deadline = time.monotonic() + duration
+
+    def client():
+        latencies = []
+        errors = 0
+        with requests.Session() as session:
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = send(session, url)
+                    ok = response.status_code == 200 and response.json().get('success')
+                except (requests.RequestException, ValueError):
+                    ok = False
+                # Fast failures must not count as a speedup
+                if ok:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+        return latencies, errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(lambda _: client(), range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for samples, _ in outcomes for latency in samples]
+    errors = sum(failures for _, failures in outcomes)
+    total = len(latencies) + errors
+    summary = latency_summary(latencies, elapsed)
+    summary['errors'] = errors
+    summary['error_rate'] = errors / total if total else 0.0
+    summary['concurrency'] = concurrency
+    return summary
+
+
+def run_load_tests(worker_counts=(1, 2, 4), duration=30, concurrency=None,
+                   warmup=5, port=5055, seed=42):
+    """Load-test a local server once per worker count"""
+    # Untrained workers would each train inside their first request
+    missing = [path for path in TRAINED_MODELS if not os.path.exists(path)]
+    if missing:
+        raise RuntimeError(
+            f"Trained models not found ({', '.join(missing)}); "
+            "run models/training_scripts/train_models.py first"
+        )
+
+    scenarios = build_scenarios(seed)
+    results = {}
+
+    for workers in worker_counts:
+        clients = concurrency or workers * 2
+        print(f"Starting server with {workers} worker(s)...")
+        process, url, metrics_dir = start_server(workers, port)
+        try:
+            run = {'workers': workers, 'scenarios': {}}
+            for name, send in scenarios.items():
+                print(f"Running {name} with {clients} client(s)...")
+                # Warm every worker before measuring
+                drive(send, url, clients, warmup)
+                run['scenarios'][name] = drive(send, url, clients, duration)
+
+            per_worker = {
+                str(pid): peak_rss_kb(pid) for pid in worker_pids(process.pid)
+            }
+            run['peak_rss_kb'] = {
+                'per_worker': per_worker,
+                'max': max(per_worker.values(), default=0)
+            }
+            results[f'workers_{workers}'] = run
+        finally:
+            stop_server(process, metrics_dir)
+
+    return results
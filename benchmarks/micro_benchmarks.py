@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.models.crop_yield_model import CropYieldPredictor
+from backend.models.disease_detection_model import DiseaseDetector
+from backend.models.recommendation_engine import RecommendationEngine
+from payloads import (
+    CROP_TYPES, DISEASES, IMAGE_RESOLUTIONS, SEASONS, leaf_image, yield_payload
+)
+from report import latency_summary
+
+
+def time_calls(func, iterations, warmup):
+    """Call func repeatedly and return the latency of each timed call"""
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run_micro_benchmarks(iterations=100, warmup=10, seed=42):
+    """Benchmark the model and recommendation entry points in-process"""
+    rng = np.random.default_rng(seed)
+
+    yield_predictor = CropYieldPredictor()
+    disease_detector = DiseaseDetector()
+    recommendation_engine = RecommendationEngine()
+    if not (yield_predictor.is_trained and disease_detector.is_trained):
+        raise RuntimeError(
+            "Trained models not found; run models/training_scripts/train_models.py first"
+        )
+
+    cases = {}
+
+    features = [yield_payload(rng) for _ in range(iterations + warmup)]
+    feature_iter = iter(features)
+    cases['crop_yield.predict'] = lambda: yield_predictor.predict(next(feature_iter))
+
+    for width, height in IMAGE_RESOLUTIONS:
+        image = leaf_image(width, height, seed=seed)
+        cases[f"disease.preprocess_image.{width}x{height}"] = (
+            lambda image=image: disease_detector.preprocess_image(image)
+        )
+        cases[f"disease.predict.{width}x{height}"] = (
+            lambda image=image: disease_detector.predict(image)
+        )
+
+    cases['recommendation.get_medicine_suggestions'] = lambda: [
+        recommendation_engine.get_medicine_suggestions(disease) for disease in DISEASES
+    ]
+    cases['recommendation.get_treatment_tips'] = lambda: [
+        recommendation_engine.get_treatment_tips(disease) for disease in DISEASES
+    ]
+    cases['recommendation.get_crop_recommendations'] = lambda: [
+        recommendation_engine.get_crop_recommendations(crop_type, season, 'benchmark')
+        for crop_type in CROP_TYPES
+        for season in SEASONS
+    ]
+
+    results = {}
+    for name, func in cases.items():
+        print(f"Running {name}...")
+        results[name] = latency_summary(time_calls(func, iterations, warmup))
+
+    return results
@@ -0,0 +1,49 @@
+import io
+
+import numpy as np
+from PIL import Image
+
+CROP_TYPES = ['wheat', 'rice', 'corn', 'soybean', 'cotton']
+SEASONS = ['spring', 'summer', 'fall', 'winter']
+DISEASES = ['healthy', 'bacterial_blight', 'brown_spot', 'leaf_blast', 'tungro']
+
+# Phone camera uploads range from thumbnails to full HD
+IMAGE_RESOLUTIONS = [(224, 224), (640, 480), (1920, 1080)]
+
+
+def yield_payload(rng):
+    """Generate a random /predict_yield request body"""
+    return {
+        'area': float(rng.uniform(0.5, 100)),
+        'rainfall': float(rng.uniform(200, 2000)),
+        'temperature': float(rng.uniform(15, 45)),
+        'humidity': float(rng.uniform(30, 90)),
+        'ph': float(rng.uniform(4.5, 8.5)),
+        'nitrogen': float(rng.uniform(0, 200)),
+        'phosphorus': float(rng.uniform(0, 100)),
+        'potassium': float(rng.uniform(0, 200)),
+        'crop_type': str(rng.choice(CROP_TYPES))
+    }
+
+
+def recommendation_payload(rng):
+    """Generate a random /get_recommendations request body"""
+    return {
+        'crop_type': str(rng.choice(CROP_TYPES)),
+        'season': str(rng.choice(SEASONS)),
+        'location': 'benchmark'
+    }
+
+
+def leaf_image(width, height, seed=0):
+    """Generate a noisy green RGB image of the given size"""
+    rng = np.random.default_rng(seed)
+    pixels = rng.normal((60, 140, 50), 30, size=(height, width, 3))
+    return Image.fromarray(np.clip(pixels, 0, 255).astype('uint8'), 'RGB')
+
+
+def encode_image(image, format='JPEG'):
+    """Encode an image the way a client would upload it"""
+    buffer = io.BytesIO()
+    image.save(buffer, format=format, quality=90)
+    return buffer.getvalue()
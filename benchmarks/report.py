@@ -0,0 +1,201 @@
+import json
+import os
+import platform
+import subprocess
+import time
+
+import numpy as np
+
+
+def latency_summary(samples, elapsed=None):
+    """Summarize latencies in seconds as milliseconds and throughput"""
+    latencies = np.array(samples) * 1000.0
+    if elapsed is None:
+        elapsed = latencies.sum() / 1000.0
+    summary = {'count': len(samples)}
+    if len(samples) == 0:
+        return summary
+
+    summary.update({
+        'mean_ms': float(latencies.mean()),
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'p99_ms': float(np.percentile(latencies, 99)),
+        'max_ms': float(latencies.max()),
+        'throughput_per_s': len(samples) / elapsed if elapsed > 0 else 0.0
+    })
+    return summary
+
+
+def environment_info():
+    """Describe the machine and revision the benchmarks ran on"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def save_results(results, path):
+    """Write results as JSON"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def load_results(path):
+    """Read results written by save_results"""
+    with open(path) as f:
+        return json.load(f)
+
+
+def flatten(results):
+    """Map every measured case to its summary, keyed by a dotted name"""
+    cases = {}
+    for name, summary in results.get('micro', {}).items():
+        cases[f"micro.{name}"] = summary
+    for workers, run in results.get('load', {}).items():
+        for name, summary in run['scenarios'].items():
+            cases[f"load.{workers}.{name}"] = summary
+        cases[f"load.{workers}.memory"] = {'peak_rss_kb': run['peak_rss_kb']['max']}
+    return cases
+
+
+# Metric name -> True if a higher value is worse
+COMPARED_METRICS = {
+    'p50_ms': True,
+    'p95_ms': True,
+    'p99_ms': True,
+    'throughput_per_s': False,
+    'peak_rss_kb': True
+}
+
+
+# Settings that must match for two runs to be comparable
+COMPARED_CONFIG = ['workers', 'duration', 'concurrency', 'iterations']
+
+
+def compare(current, baseline, threshold=0.1):
+    """Compare two result sets and list the cases that got worse
+
+    A case regresses when a metric moves in the bad direction by more
+    than threshold, expressed as a fraction of the baseline value, or
+    when its error rate is higher than in the baseline. Baseline cases
+    missing from the current run and differing run settings are listed
+    too, since the comparison cannot vouch for them.
+    """
+    current_cases = flatten(current)
+    baseline_cases = flatten(baseline)
+    regressions = []
+
+    for key in COMPARED_CONFIG:
+        new = current.get('config', {}).get(key)
+        old = baseline.get('config', {}).get(key)
+        if new != old:
+            regressions.append({
+                'case': f"config.{key}",
+                'metric': 'config',
+                'baseline': old,
+                'current': new
+            })
+
+    for case in baseline_cases:
+        if case not in current_cases:
+            regressions.append({
+                'case': case,
+                'metric': 'missing',
+                'baseline': None,
+                'current': None
+            })
+
+    for case, summary in current_cases.items():
+        if case not in baseline_cases:
+            continue
+        for metric, higher_is_worse in COMPARED_METRICS.items():
+            new = summary.get(metric)
+            old = baseline_cases[case].get(metric)
+            if new is None or not old:
+                continue
+            change = (new - old) / old
+            if (change if higher_is_worse else -change) > threshold:
+                regressions.append({
+                    'case': case,
+                    'metric': metric,
+                    'baseline': old,
+                    'current': new,
+                    'change': change
+                })
+
+        # Any rise in failed requests is a regression, whatever the threshold
+        new_rate = summary.get('error_rate')
+        old_rate = baseline_cases[case].get('error_rate', 0.0)
+        if new_rate is not None and new_rate > old_rate:
+            regressions.append({
+                'case': case,
+                'metric': 'error_rate',
+                'baseline': old_rate,
+                'current': new_rate,
+                'change': new_rate - old_rate
+            })
+
+    return regressions
+
+
+def print_results(results):
+    """Print a table of the measured cases"""
+    print(
+        f"{'case':<55} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9} {'errors':>7}"
+    )
+    for case, summary in flatten(results).items():
+        errors = f"{summary['error_rate']:>7.1%}" if 'error_rate' in summary else ''
+        if 'peak_rss_kb' in summary:
+            print(f"{case:<55} peak RSS {summary['peak_rss_kb'] / 1024:.1f} MiB")
+        elif summary.get('count'):
+            print(
+                f"{case:<55} {summary['p50_ms']:>9.2f} {summary['p95_ms']:>9.2f} "
+                f"{summary['p99_ms']:>9.2f} {summary['throughput_per_s']:>9.1f} {errors}"
+            )
+        else:
+            print(f"{case:<55} no successful requests {errors}")
+
+
+def print_regressions(regressions, threshold):
+    """Print the regressions found by compare"""
+    if not regressions:
+        print(f"No regressions above {threshold:.0%} against baseline")
+        return
+
+    print(f"{len(regressions)} regression(s) against baseline (threshold {threshold:.0%}):")
+    for regression in regressions:
+        if regression['metric'] == 'config':
+            print(
+                f"  {regression['case']} differs: "
+                f"{regression['baseline']} -> {regression['current']}"
+            )
+            continue
+        if regression['metric'] == 'missing':
+            print(f"  {regression['case']} is in the baseline but was not run")
+            continue
+        if regression['metric'] == 'error_rate':
+            print(
+                f"  {regression['case']} error_rate: "
+                f"{regression['baseline']:.1%} -> {regression['current']:.1%}"
+            )
+            continue
+        print(
+            f"  {regression['case']} {regression['metric']}: "
+            f"{regression['baseline']:.2f} -> {regression['current']:.2f} "
+            f"({regression['change']:+.1%})"
+        )
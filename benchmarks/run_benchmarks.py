@@ -0,0 +1,80 @@
+"""Benchmark and load-test suite for the smart agriculture backend
+
+Run from the repository root after training the models:
+
+    python benchmarks/run_benchmarks.py --suite all --save-baseline benchmarks/results/baseline.json
+    python benchmarks/run_benchmarks.py --suite all --baseline benchmarks/results/baseline.json
+
+Results are written as JSON. Latencies and throughput count successful
+requests only; failures are reported as an error rate. When a baseline
+is given, cases whose latency, throughput or peak memory got worse by
+more than the threshold, or whose error rate rose at all, are listed
+and the script exits with status 1. Baseline cases that were not run
+and differing run settings are reported the same way.
+"""
+import argparse
+import os
+import sys
+
+from report import (
+    compare, environment_info, load_results, print_regressions, print_results,
+    save_results
+)
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(__file__), 'results', 'latest.json')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--suite', choices=['micro', 'load', 'all'], default='all')
+    parser.add_argument('--iterations', type=int, default=100,
+                        help='timed calls per micro-benchmark')
+    parser.add_argument('--warmup', type=int, default=10,
+                        help='untimed calls before each micro-benchmark')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4],
+                        help='gunicorn worker counts to load-test')
+    parser.add_argument('--duration', type=float, default=30,
+                        help='seconds to load-test each scenario')
+    parser.add_argument('--concurrency', type=int, default=None,
+                        help='concurrent clients (default: twice the worker count)')
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--baseline', help='results file to compare against')
+    parser.add_argument('--save-baseline', help='also write the results here')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='allowed relative slowdown before flagging a regression')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    results = {'environment': environment_info(), 'config': vars(args)}
+
+    if args.suite in ('micro', 'all'):
+        from micro_benchmarks import run_micro_benchmarks
+        results['micro'] = run_micro_benchmarks(args.iterations, args.warmup, args.seed)
+
+    if args.suite in ('load', 'all'):
+        from load_test import run_load_tests
+        results['load'] = run_load_tests(
+            args.workers, args.duration, args.concurrency, port=args.port, seed=args.seed
+        )
+
+    save_results(results, args.output)
+    print(f"\nResults written to {args.output}")
+    if args.save_baseline:
+        save_results(results, args.save_baseline)
+        print(f"Baseline written to {args.save_baseline}")
+
+    print_results(results)
+
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.threshold)
+        print_regressions(regressions, args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import os
+import shutil
+
+bind = '0.0.0.0:5000'
+workers = 4
+
+# Metrics from every worker are written here and merged by /metrics. This
+# must be set before prometheus_client is imported anywhere in the master,
+# since the library picks its multiprocess value class at import time.
+prometheus_dir = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', '/tmp/smart_agriculture_metrics'
+)
+
+
+def on_starting(server):
+    """Clear metric files left behind by a previous run"""
+    shutil.rmtree(prometheus_dir, ignore_errors=True)
+    os.makedirs(prometheus_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """Drop live gauges of a worker that has exited"""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)